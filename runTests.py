@@ -4,109 +4,274 @@ import sys
 import re
 import csv 
 from pathlib import Path
+from collections import namedtuple, Counter
 import time 
 import tempfile
 import argparse
 import threading
+import concurrent.futures
+import multiprocessing
+import signal
+import weakref
+import fcntl
+import multiprocessing.util
 import shutil
+import hashlib
+import functools
+
+
+# Generated inputs (MONA output, Christian's input files) are cached here, keyed by content hash
+CACHE_DIR = Path("~/.cache/ltlf-po-benchmarks").expanduser()
 
 
 class Solver():
     def __init__(self, path, name=None):
         self.path = Path(path).expanduser().resolve()
+        self.path_str = str(self.path)
         self.name = name if name else str(self.path)
+        self.parent = self.path.parent
 
-    def get_command(self, input_file, part_file, mode)-> str:
-        """Returns the command string to execute.
+    # Whether the test files are linked into the run's scratch dir first. Solvers
+    # that write files next to their inputs need this, others read them in place.
+    needs_staging = True
+
+    def get_command(self, input_file, part_file, mode, source_dir=None)-> list:
+        """Returns the command to execute, as an argument list.
 
         Args:
             input_file (str): The input file path.
             part_file (str): The part file path.
             mode (str): The mode.
+            source_dir (str): The directory of the test's .mona sources. Only given to solvers
+                that read their inputs in place, staged solvers get None.
         Returns:
-            str: The command string to execute.
+            list: The command to execute, or an empty list on error.
         """
         raise NotImplementedError
 
-    def parse_output(self, output_bytes)-> (int, float):
-        """Returns (result_code, time_ms) from tool output. result: 1=Realizable, 0=Unrealizable"""
+    # Verdict strings, looked for anywhere in the output while it streams in
+    # since only its tail is kept
+    verdict_markers = ()
+
+    def parse_output(self, output_bytes, markers)-> (int, float):
+        """Returns (result_code, time_ms) from tool output. result: 1=Realizable, 0=Unrealizable.
+        output_bytes is the tail of the output, markers the verdict_markers found in all of it.
+        time_ms is None if the tool did not report it."""
         raise NotImplementedError
 
+    def dfa_sources(self, tests, mode)-> list:
+        """Returns the MONA sources the given tests need compiled in this mode."""
+        return []
+
     def get_name(self)-> str:
         return self.name
 
 
-def get_variables_from_part(part_file):
-    vars = set()
-    if os.path.exists(part_file):
-        with open(part_file, 'r') as f:
-            for line in f:
-                line = line.strip().lower()
-                if line.startswith('.') and ':' in line:
-                    vars.update(line.split(':')[1].strip().split())
-                elif any(line.startswith(k) for k in ['inputs', 'outputs', 'unobservables']):
-                    parts = line.split()
-                    if len(parts) > 1:
-                        vars.update(parts[1:])
-    return sorted(list(vars))
-
-def get_safe_true(part_file):
-    vars = get_variables_from_part(part_file)
-    if not vars:
-        return "true"
-    # Return a list of tautologies, one for each variable
-    return " && ".join([f"{v} | ~{v}" for v in vars])
+def _link_or_copy(src, dst):
+    """Hardlinks src to dst, falling back to a symlink across filesystems and to a
+    copy if neither is possible. Only use it for files that are never written to."""
+    try:
+        os.link(src, dst)
+        return
+    except FileExistsError:
+        # Shadows a solver helper of the same name, which must not be written through
+        os.unlink(dst)
+        return _link_or_copy(src, dst)
+    except OSError:
+        pass
+    try:
+        os.symlink(os.path.abspath(src), dst)
+    except FileExistsError:
+        os.unlink(dst)
+        return _link_or_copy(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def _scan_dir(path):
+    """Returns the names in a directory (empty if it does not exist), so
+    existence checks become set lookups instead of one stat per candidate."""
+    try:
+        with os.scandir(path) as it:
+            return frozenset(entry.name for entry in it)
+    except FileNotFoundError:
+        return frozenset()
+
+# The test tree does not change during a run, so each source directory is
+# listed at most once per process
+_scan_source_dir = functools.lru_cache(maxsize=None)(_scan_dir)
+
+def _link_solver_dir(solver, temp_dir):
+    """Symlinks the executables next to the solver binary into temp_dir, so the
+    solver can run with temp_dir as its cwd and find any helper tools it expects.
+    Data files and subdirectories are not linked, so a solver writing into its
+    cwd never writes into the shared solver directory.
+
+    Returns:
+        dict: The link targets, by name.
+    """
+    linked = {}
+    with os.scandir(solver.parent) as it:
+        for entry in it:
+            if entry.is_file() and os.access(entry.path, os.X_OK):
+                os.symlink(entry.path, os.path.join(temp_dir, entry.name))
+                linked[entry.name] = entry.path
+    return linked
+
+def _file_key(path):
+    """Identifies a version of a file: staged links share it, and editing the file changes it."""
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _hash_bytes(data):
+    # blake2b is cheaper than sha1/sha256 and 128 bits is plenty for a cache key
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _hash_file(path):
+    with open(path, 'rb') as f:
+        return _hash_bytes(f.read())
+
+@functools.lru_cache(maxsize=None)
+def _compile_dfa(source_hash, mona_source):
+    """Returns the cached DFA for a MONA source with the given content hash, running MONA on a cache miss.
+
+    Args:
+        source_hash (str): The content hash of mona_source.
+        mona_source (str): The MONA source file path.
+    Returns:
+        Path: The cached DFA file, or None if MONA failed.
+    """
+    cached_dfa = CACHE_DIR / source_hash / "out.dfa"
+    if cached_dfa.exists():
+        return cached_dfa
+
+    cached_dfa.parent.mkdir(parents=True, exist_ok=True)
+    # Only one worker (or concurrent run) builds a given DFA, the others wait and reuse it
+    with open(cached_dfa.parent / "lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if cached_dfa.exists():
+            return cached_dfa
+
+        # MONA writes straight into a temp file that is then moved into place,
+        # so readers that do not take the lock never see a partially written DFA
+        fd, tmp_dfa = tempfile.mkstemp(dir=cached_dfa.parent, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as out:
+            mona_out = subprocess.run(["mona", "-u", "-xw", mona_source], stdout=out, stderr=subprocess.PIPE)
+        if mona_out.returncode != 0:
+            os.unlink(tmp_dfa)
+            print(f"Error: MONA failed on {mona_source}: {mona_out.stderr.decode('utf-8', errors='replace').strip()}")
+            return None
+
+        os.replace(tmp_dfa, cached_dfa)
+        return cached_dfa
+
+def _prepare_dfa(mona_source):
+    return _compile_dfa(_hash_file(mona_source), mona_source) is not None
+
+
+# A part file line, in either Lucas' ("inputs a b") or Christian's (".inputs: a b") format
+_PART_RE = re.compile(r'^[ \t]*\.?(inputs|outputs|unobservables)\b[ \t]*:?[ \t]*(.*)$', re.I | re.M)
+_TOK_RE = re.compile(r'[a-z0-9_]+')
+
+# Solver output, matched as bytes: any number (Christian's time line), and a time in ms (Lucas)
+_NUM_RE = re.compile(rb"[-+]?[.]?[\d]+(?:,\d\d\d)*[\.]?\d*(?:[eE][-+]?\d+)?")
+_MS_RE = re.compile(rb"(\d+\.?\d*)\s*ms")
+
+# Sorted variable lists of a part file, plus the tautology over all of them
+Part = namedtuple("Part", "inputs outputs unobs all_vars safe_true")
+
+def parse_part(content):
+    """Parses part file content into a Part in a single pass."""
+    groups = {'inputs': set(), 'outputs': set(), 'unobservables': set()}
+    for m in _PART_RE.finditer(content.lower()):
+        groups[m.group(1)].update(_TOK_RE.findall(m.group(2)))
+    all_vars = sorted(groups['inputs'] | groups['outputs'] | groups['unobservables'])
+    # A tautology for each variable, or plain true if there are none
+    safe_true = " && ".join(f"{v} | ~{v}" for v in all_vars) if all_vars else "true"
+    return Part(sorted(groups['inputs']), sorted(groups['outputs']), sorted(groups['unobservables']),
+                all_vars, safe_true)
+
+def to_christian_part(content):
+    """Returns the part file content in Christian's ".inputs: ..." format."""
+    return _PART_RE.sub(lambda m: f".{m.group(1).lower()}: {m.group(2)}", content)
+
+def _write_cached(path, text):
+    """Writes a cache entry that is not there yet. Concurrent writers produce the same
+    content, so the entry is just moved into place without a lock."""
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+@functools.lru_cache(maxsize=None)
+def _christian_inputs(input_key, part_key, input_file, part_file):
+    """Returns Christian's versions of an .ltlf file and its part file, generating them on first use.
+
+    Args:
+        input_key, part_key: The _file_key of each file, so a new version is converted again.
+        input_file (str): The .ltlf file path.
+        part_file (str): The part file path.
+    Returns:
+        tuple: The cached .ltlf file, and the cached part file or None if part_file
+            is already in Christian's format.
+    """
+    with open(input_file, 'r') as f:
+        formula = f.read().strip()
+    with open(part_file, 'r') as f:
+        content = f.read()
+
+    # Christian's Syft expects the .ltlf file to have exactly 2 lines:
+    # Line 1: main formula
+    # Line 2: backup formula (tautology)
+    ltlf = f"{formula}\n{parse_part(content).safe_true}\n"
+    converted = to_christian_part(content)
+    entry = CACHE_DIR / _hash_bytes((ltlf + converted).encode())
+
+    _write_cached(entry / "christian.ltlf", ltlf)
+    if converted == content:
+        return entry / "christian.ltlf", None
+    _write_cached(entry / "christian.part", converted)
+    return entry / "christian.ltlf", entry / "christian.part"
 
 class ChristianSyftSolver(Solver):
-    def get_command(self, input_file, part_file, mode)-> str:
-        # Christian's Syft expects .main and .backup files
-        # and handles ltlf2fol conversion internally
-        
-        if not part_file.endswith('.christian.part'):
-            christian_part = part_file + '.christian.part'
-            if not os.path.exists(christian_part):
-                with open(part_file, 'r') as f:
-                    content = f.read()
-                with open(christian_part, 'w') as f:
-                    f.write(content.replace('inputs:', '.inputs:').replace('outputs:', '.outputs:'))
-            part_file = christian_part
-
-        if not input_file.endswith('christian.ltlf'):
-            christian_input = input_file + '.christian.ltlf'
-            if not os.path.exists(christian_input):
-                with open(input_file, 'r') as f:
-                    content = f.read().strip()
-                
-                # Christian's Syft expects the .ltlf file to have exactly 2 lines:
-                # Line 1: main formula
-                # Line 2: backup formula (tautology)
-                safe_true = get_safe_true(part_file)
-                
-                with open(christian_input, 'w') as f:
-                    f.write(content + '\n')
-                    f.write(safe_true + '\n')
-                    
-            input_file = christian_input
+    verdict_markers = (b"Unrealizable", b"Realizable")
+
+    def get_command(self, input_file, part_file, mode, source_dir=None)-> list:
+        # Christian's Syft expects its own part format and a backup formula in the
+        # .ltlf file, both generated once per file version and linked in here
+        try:
+            keys = _file_key(input_file), _file_key(part_file)
+        except FileNotFoundError as e:
+            print(f"[{self.get_name()}] Error: {e.filename} not found.")
+            return []
+        christian_input, christian_part = _christian_inputs(*keys, input_file, part_file)
+
+        input_file += '.christian.ltlf'
+        _link_or_copy(christian_input, input_file)
+        if christian_part is not None:
+            part_file += '.christian.part'
+            _link_or_copy(christian_part, part_file)
         
         # Christian's Syft takes the .ltlf file and handles conversion internally
-        return f'"{self.path}" {input_file} {part_file} 0 {mode}'
+        return [self.path_str, input_file, part_file, "0", mode]
 
-    def parse_output(self, output_bytes)-> (int, float):
-        l_str = str(output_bytes)
-        lines = l_str.split("\\n")
-        # Try to find the time in output 
+    def parse_output(self, output_bytes, markers)-> (int, float):
+        # The time is on the second to last line, so only split off the last two
+        lines = output_bytes.rsplit(b"\n", 2)
         try:
-            rr = re.findall("[-+]?[.]?[\d]+(?:,\d\d\d)*[\.]?\d*(?:[eE][-+]?\d+)?", lines[-2])
+            rr = _NUM_RE.findall(lines[-2])
             assert(len(rr) == 1)
-            time_ms = float(rr[0])
+            time_ms = float(rr[0].decode('ascii'))
         except Exception:
-            # Fallback for if output structure differs
-            time_ms = 0.0
+            # Output structure differs, the caller falls back to wall time
+            time_ms = None
         
         result = None 
-        if "Unrealizable" in l_str:
+        if b"Unrealizable" in markers:
             result = 0
-        if "Realizable" in l_str:
+        if b"Realizable" in markers:
             result = 1
 
         # if result == 1:
@@ -116,90 +281,122 @@ class ChristianSyftSolver(Solver):
 
 
 class LucasSyftSolver(Solver):
-    def get_command(self, input_file, part_file, mode)-> str:
-        # Configuration based on lucas-benchmarks-instructions.txt:
-        # direct (Belief-states): partial dfa, uses .dfa, .part
-        # belief (Projection-based): partial cordfa, uses .dfa.rev.neg, .part.rev.neg
-        # mso (MSO): full dfa, uses .dfa.quant, .part.quant
-        config = {
-            "direct": ("partial", "dfa", ".dfa", ""),
-            "belief": ("partial", "cordfa", ".dfa.rev.neg", ".rev.neg"),
-            "mso":    ("full",    "dfa", ".dfa.quant",   ".quant")
-        }
-        
-        obs, inp_type, dfa_suffix, part_suffix = config.get(mode, ("partial", "dfa", ".dfa", ""))
+    # Configuration based on lucas-benchmarks-instructions.txt:
+    # direct (Belief-states): partial dfa, uses .dfa, .part
+    # belief (Projection-based): partial cordfa, uses .dfa.rev.neg, .part.rev.neg
+    # mso (MSO): full dfa, uses .dfa.quant, .part.quant
+    config = {
+        "direct": ("partial", "dfa", ".dfa", ""),
+        "belief": ("partial", "cordfa", ".dfa.rev.neg", ".rev.neg"),
+        "mso":    ("full",    "dfa", ".dfa.quant",   ".quant")
+    }
+    # Only reads its inputs, the DFA is passed straight from the cache.
+    # get_command relies on this, so it is not meant to be overridden.
+    needs_staging = False
+    verdict_markers = (b"unrealizable", b"realizable")
+
+    def dfa_sources(self, tests, mode)-> list:
+        dfa_suffix = self.config.get(mode, self.config["direct"])[2]
+        mona_suffix = dfa_suffix.replace(".dfa", ".mona")
+        sources = set()
+        for test in tests:
+            # A prebuilt DFA next to the .ltlf file is used as is
+            if test.ltlf.name + dfa_suffix in _scan_source_dir(test.ltlf.parent):
+                continue
+            if test.stem + mona_suffix in _scan_source_dir(test.mso_dir):
+                sources.add(str(test.mso_dir / (test.stem + mona_suffix)))
+        return sorted(sources)
+
+    def get_command(self, input_file, part_file, mode, source_dir)-> list:
+        obs, inp_type, dfa_suffix, part_suffix = self.config.get(mode, self.config["direct"])
         
         dfa_file = input_file + dfa_suffix
         actual_part_file = part_file + part_suffix
         
+        # The inputs are read in place, so the cached listings of the test tree apply.
         # Check if actual_part_file exists, else use base part_file
-        if not os.path.exists(actual_part_file):
+        if os.path.basename(actual_part_file) not in _scan_source_dir(os.path.dirname(part_file)):
             print(f"Missing part file for {input_file}, missing suffix {part_suffix}")
             actual_part_file = part_file
 
-        if not os.path.exists(dfa_file):
+        if os.path.basename(dfa_file) not in _scan_source_dir(os.path.dirname(input_file)):
             # Try to find a source MONA file to generate the DFA
             # For .dfa, look for .mona; for .dfa.quant, look for .mona.quant; for .dfa.rev.neg, look for .mona.rev.neg
             mona_source_suffix = dfa_suffix.replace(".dfa", ".mona")
             stem = Path(input_file).stem
-            mona_source = os.path.join(os.path.dirname(input_file), stem + mona_source_suffix)
+            mona_source = os.path.join(source_dir, stem + mona_source_suffix)
             
-            if os.path.exists(mona_source):
-                # Run MONA on the source file to get the DFA
-                mona_out = subprocess.run(["mona", "-u", "-xw", mona_source], text=True, capture_output=True)
-                with open(dfa_file, 'w') as f:
-                    f.write(mona_out.stdout)
+            if os.path.basename(mona_source) in _scan_source_dir(source_dir):
+                # Run MONA on the source file to get the DFA, reusing the output
+                # of any earlier run on identical source
+                cached_dfa = _compile_dfa(_hash_file(mona_source), mona_source)
+                if cached_dfa is None:
+                    return []
+                dfa_file = str(cached_dfa)
             else:
                 print(f"[{self.get_name()}] Error: {dfa_file} not found and no source {mona_source} to generate it.")
-                return ""
+                return []
 
-        return f'"{self.path}" {dfa_file} {actual_part_file} 0 {obs} {inp_type}'
+        return [self.path_str, dfa_file, actual_part_file, "0", obs, inp_type]
 
-    def parse_output(self, output_bytes):
+    def parse_output(self, output_bytes, markers):
         # Reuse logic or customize if lucas output differs significantly
-        l_str = str(output_bytes)
         result = None 
-        if "unrealizable" in l_str: result = 0
-        elif "realizable" in l_str: result = 1
+        if b"unrealizable" in markers: result = 0
+        elif b"realizable" in markers: result = 1
         
-        # Lucas Syft often prints time in ms at the end
-        lines = l_str.strip().split("\\n")
-        time_ms = 0.0
-        for line in reversed(lines):
-            rr = re.findall(r"(\d+\.?\d*)\s*ms", line)
-            if rr:
-                time_ms = float(rr[0])
-                break
+        # Lucas Syft often prints time in ms at the end: take the first time on the
+        # last line that has one. That is usually the line of the last " ms", so try
+        # it first and only split the tail into lines if a later line has a time too
+        time_ms = None
+        end = output_bytes.rfind(b" ms")
+        if end >= 0:
+            line_start = output_bytes.rfind(b"\n", 0, end) + 1
+            line_end = output_bytes.find(b"\n", end)
+            if line_end < 0:
+                line_end = len(output_bytes)
+            m = _MS_RE.search(output_bytes, line_start, line_end)
+            if m and not _MS_RE.search(output_bytes, line_end):
+                time_ms = float(m.group(1))
+        if time_ms is None:
+            for line in reversed(output_bytes[-4096:].split(b"\n")):
+                m = _MS_RE.search(line)
+                if m:
+                    time_ms = float(m.group(1))
+                    break
 
         # TODO: need to save the output of the tool
         return result, time_ms
 
 class Statistics():
+    # Only updated from the main thread: workers return their results instead
     def __init__(self):
-        self.stats = {'passed': 0, 'failed': 0, 'timeout': 0, 'other': 0, 'error': 0, 'inconsistent': 0}
-        self.results = {} # test_path -> (time, status)
-        self.lock = threading.Lock()
+        self.stats = Counter() # outcome -> count; 'passed', 'failed', 'timeout', 'other', 'error' or 'inconsistent'
+        self.writer = None # results are streamed to this csv writer as they arrive
 
+    def set_output(self, csvfile):
+        self.writer = csv.writer(csvfile)
+        self.writer.writerow(["test", "time", "status"])
 
     def add_result(self, test_path, time, status, outcome):
-        with self.lock:
-            self.results[test_path] = (time, status)
-            if outcome == 'passed': self.stats['passed'] += 1
-            elif outcome == 'failed': self.stats['failed'] += 1
-            elif outcome == 'timeout': self.stats['timeout'] += 1
-            elif outcome == 'other': self.stats['other'] += 1
-            elif outcome == 'error': self.stats['error'] += 1
-            elif outcome == 'inconsistent': self.stats['inconsistent'] += 1
+        if self.writer is not None:
+            self.writer.writerow([test_path, time, status])
+        self.stats[outcome] += 1
 
 # for statistics 
 statistics = Statistics()
 
 
+# A collected test: its .ltlf file, its .part file, the directory holding its
+# .mona sources, and its name without suffix
+TestSpec = namedtuple("TestSpec", "ltlf part mso_dir stem")
+
 def collectTest(testDir):
     global statistics
     p = Path(testDir).resolve()
     
     tests = []
+    part_files = set()
 
     if p.is_file():
         if p.suffix == ".ltlf":
@@ -208,10 +405,18 @@ def collectTest(testDir):
             print(f"File {p} is not an .ltlf file.")
             return []
     else:
-        test_files = list(p.rglob("**/ltlf/**/*.ltlf"))
+        # A single walk finds both the tests (anywhere below an "ltlf" directory)
+        # and the part files that exist, so no per-test stat is needed below
+        test_files = []
+        for dirpath, dirnames, filenames in os.walk(p):
+            rel_parts = Path(dirpath).relative_to(p).parts
+            if "ltlf" in rel_parts:
+                test_files.extend(Path(dirpath, name) for name in filenames if name.endswith(".ltlf"))
+            if "part" in rel_parts:
+                part_files.update(os.path.join(dirpath, name) for name in filenames if name.endswith(".part"))
 
     for file in test_files:
-        test_path = file.resolve()
+        test_path = file
         
         # Try to find part file by replacing "ltlf" with "part" in the path
         parts = list(test_path.parts)
@@ -221,12 +426,16 @@ def collectTest(testDir):
             part_parts[idx] = "part"
             part_file = Path(*part_parts).with_suffix(".part")
             
-            if not part_file.exists():
+            if str(part_file) not in part_files and not part_file.exists():
                 statistics.add_result(test_path, 0, 0, "other")
                 print(f"Missing part file for {test_path} (expected at {part_file})")
                 continue
+
+            mso_parts = list(parts)
+            mso_parts[idx] = "mso"
+            mso_dir = Path(*mso_parts).parent
             
-            tests.append(test_path)
+            tests.append(TestSpec(test_path, part_file, mso_dir, test_path.stem))
         else:
             print(f"Test file {test_path} not under an 'ltlf' directory, skipping.")
 
@@ -236,109 +445,249 @@ def collectTest(testDir):
 TIMEOUT_CODE = -2
 ERROR_CODE = -1
 
-def executeTest(test, timeout, solver: Solver, mode="direct", iter=1):
-    temp_dir = tempfile.mkdtemp()
+# Solver processes currently running in this worker, and whether the run was interrupted
+_LIVE_PROCS = weakref.WeakSet()
+_interrupted = False
+
+def _kill_group(proc):
+    """Kills a solver together with any helpers it started (it leads its own session)."""
     try:
-        test_path = Path(test).resolve()
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _on_worker_sigint(signum, frame):
+    # Kill our solvers but keep the worker alive, so the pool shuts down cleanly
+    global _interrupted
+    _interrupted = True
+    for proc in list(_LIVE_PROCS):
+        _kill_group(proc)
+
+def _init_worker(cpu_queue=None):
+    # A handler rather than SIG_IGN, so solvers still get the default SIGINT behaviour
+    signal.signal(signal.SIGINT, _on_worker_sigint)
+    if cpu_queue is not None:
+        # Each worker takes its own CPU, which the solvers it starts inherit
+        os.sched_setaffinity(0, {cpu_queue.get()})
+
+# Scratch directory reused by every test run in this process, and the solver
+# helpers linked into it once
+_scratch = None
+_solver_links = None
+
+def _scratch_dir():
+    global _scratch
+    if _scratch is None:
+        _scratch = tempfile.mkdtemp(prefix="ltlf_")
+        # Runs when a pool worker (or the main process) exits normally
+        multiprocessing.util.Finalize(None, shutil.rmtree, args=(_scratch, True), exitpriority=0)
+    return _scratch
+
+def _clear_dir(path, keep=None):
+    """Empties path, except for the symlinks in keep (targets by name). Those are
+    restored if a staged file of the same name replaced them."""
+    keep = keep or {}
+    kept = set()
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink() and keep.get(entry.name) == os.readlink(entry.path):
+                kept.add(entry.name)
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    for name in keep.keys() - kept:
+        os.symlink(keep[name], os.path.join(path, name))
+
+# Only the end of a solver's output is kept, which is where the verdict and the time are
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+def _read_tail(read, tail, markers, found):
+    """Reads everything from read into tail, keeping only its end, and adds the
+    markers that appear anywhere in it to found."""
+    overlap = max(map(len, markers), default=1) - 1
+    for chunk in iter(lambda: read(OUTPUT_TAIL_BYTES), b''):
+        tail += chunk
+        # Include the end of the previous chunk, for markers split across reads
+        window = tail[-(len(chunk) + overlap):]
+        found.update(m for m in markers if m not in found and m in window)
+        del tail[:-OUTPUT_TAIL_BYTES]
+
+def _run_solver(command, timeout, cwd, log_path=None, markers=()):
+    """Runs a solver like subprocess.check_output, keeping track of it in _LIVE_PROCS.
+
+    Returns the last OUTPUT_TAIL_BYTES of its stdout, and the markers found anywhere
+    in it. If log_path is given, stdout is written there in full and read back from
+    it, and stderr goes to the same path with an .err suffix. Otherwise stderr is inherited.
+    """
+    tail = bytearray()
+    found = set()
+    reader = None
+    log_file = open(log_path, 'wb') if log_path else None
+    err_file = open(log_path.with_suffix(".err"), 'wb') if log_path else None
+    try:
+        stdout = log_file if log_file else subprocess.PIPE
+        # stderr is never parsed, so logging does not change what is parsed
+        with subprocess.Popen(command, stdout=stdout, stderr=err_file, cwd=cwd, start_new_session=True) as proc:
+            _LIVE_PROCS.add(proc)
+            if log_file is None:
+                fd = proc.stdout.fileno()
+                reader = threading.Thread(target=_read_tail, args=(lambda n: os.read(fd, n), tail, markers, found),
+                                          daemon=True)
+                reader.start()
+            deadline = time.monotonic() + timeout
+            try:
+                proc.wait(timeout=timeout)
+                if reader is not None:
+                    # Helpers the solver left running may still hold the pipe open
+                    reader.join(max(0, deadline - time.monotonic()))
+                    if reader.is_alive():
+                        raise subprocess.TimeoutExpired(command, timeout)
+            except BaseException:
+                # Also stops the helpers (ltlf2fol, mona) the solver started
+                _kill_group(proc)
+                if reader is not None:
+                    reader.join(1)
+                raise
+    finally:
+        if log_file is not None:
+            log_file.close()
+            err_file.close()
+
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+    if log_path:
+        with open(log_path, 'rb') as f:
+            _read_tail(f.read, tail, markers, found)
+    return bytes(tail), frozenset(found)
+
+def executeTest(test: TestSpec, timeout, solver: Solver, mode="direct", iter=1, logdir=None):
+    """Runs a single test in a worker process.
+
+    Returns:
+        tuple: (test, time, status, outcome) to pass to statistics.add_result,
+        or None if the test could not be run.
+    """
+    global _solver_links
+    if _interrupted:
+        return None
+    temp_dir = _scratch_dir()
+    if _solver_links is None:
+        # Each run gets its own cwd, so parallel solvers never share scratch files
+        _solver_links = _link_solver_dir(solver, temp_dir)
+    try:
+        test_path = test.ltlf
         test_name = test_path.name
-        test_stem = test_path.stem
-        
-        # Strategy: find the index of "ltlf" in the parts of the path
-        # and replace it with "part" or "mso" to find related files
-        parts = list(test_path.parts)
-        if "ltlf" not in parts:
-            print(f"Error: {test} is not under an 'ltlf' directory.")
-            return
+        test_stem = test.stem
+        original_part = test.part
+        mso_dir = test.mso_dir
 
-        ltlf_idx = parts.index("ltlf")
-        
-        # Construct part file path
-        part_parts = list(parts)
-        part_parts[ltlf_idx] = "part"
-        original_part = Path(*part_parts).with_suffix(".part")
-
-        # Construct mso directory path
-        mso_parts = list(parts)
-        mso_parts[ltlf_idx] = "mso"
-        mso_dir = Path(*mso_parts).parent
-
-        inputfile = os.path.join(temp_dir, test_name)
-        partfile = os.path.join(temp_dir, test_stem + ".part")
-
-        # Copy the test files
-        shutil.copy2(test, inputfile)
-        if original_part.exists():
-            shutil.copy2(original_part, partfile)
-        else:
+        part_entries = _scan_source_dir(original_part.parent)
+        if original_part.name not in part_entries:
             print(f"Warning: Part file {original_part} not found.")
+
+        if not solver.needs_staging:
+            # The solver reads the test files in place
+            inputfile, partfile, source_dir = str(test_path), str(original_part), mso_dir
+        else:
+            inputfile = os.path.join(temp_dir, test_name)
+            partfile = os.path.join(temp_dir, test_stem + ".part")
+
+            test_entries = _scan_source_dir(test_path.parent)
+            mso_entries = _scan_source_dir(mso_dir)
+
+            # Stage the test files. Solvers only read them and write any derived
+            # files under new names, so hardlinks are enough
+            _link_or_copy(test_path, inputfile)
+            if original_part.name in part_entries:
+                _link_or_copy(original_part, partfile)
         
-        # Copy DFA files if they exist (next to the .ltlf file)
-        for dfa_suffix in [".dfa", ".dfa.rev.neg", ".dfa.quant"]:
-            dfa_src = str(test) + dfa_suffix
-            if os.path.exists(dfa_src):
-                shutil.copy2(dfa_src, inputfile + dfa_suffix)
+            # Copy DFA files if they exist (next to the .ltlf file)
+            for dfa_suffix in [".dfa", ".dfa.rev.neg", ".dfa.quant"]:
+                dfa_src = str(test_path) + dfa_suffix
+                if test_name + dfa_suffix in test_entries:
+                    _link_or_copy(dfa_src, inputfile + dfa_suffix)
         
-        # Copy part file variants if they exist
-        for part_suffix in [".rev.neg", ".quant"]:
-            part_src = str(original_part) + part_suffix
-            if os.path.exists(part_src):
-                shutil.copy2(part_src, partfile + part_suffix)
+            # Copy part file variants if they exist
+            for part_suffix in [".rev.neg", ".quant"]:
+                part_src = str(original_part) + part_suffix
+                if original_part.name + part_suffix in part_entries:
+                    _link_or_copy(part_src, partfile + part_suffix)
         
-        # Copy .mona files from mso directory if they exist
-        if mso_dir.exists():
-            for mona_suffix in [".mona", ".mona.rev.neg", ".mona.quant"]:
-                mona_src = mso_dir / (test_stem + mona_suffix)
-                if mona_src.exists():
-                    mona_dst = os.path.join(temp_dir, test_stem + mona_suffix)
-                    shutil.copy2(mona_src, mona_dst)
-
-        command = solver.get_command(inputfile, partfile, mode)
+            # Copy .mona files from mso directory if they exist
+            if mso_entries:
+                for mona_suffix in [".mona", ".mona.rev.neg", ".mona.quant"]:
+                    mona_src = mso_dir / (test_stem + mona_suffix)
+                    if mona_src.name in mso_entries:
+                        mona_dst = os.path.join(temp_dir, test_stem + mona_suffix)
+                        _link_or_copy(mona_src, mona_dst)
+
+            source_dir = None
+
+        command = solver.get_command(inputfile, partfile, mode, source_dir)
         if not command:
             return
 
-        times = []
-        results = []
+        total_time = 0
+        runs = 0
+        timed_out = False
+        errored = False
+        first = None # verdict of the first successful run
+        consistent = True
 
         for i in range(iter):
             try:
-                l = subprocess.check_output(command, timeout=timeout, shell=True, cwd=solver.path.parent)
-                result, time = solver.parse_output(l)
+                log_path = Path(logdir) / f"{test_stem}.{solver.get_name()}.{mode}.{i}.log" if logdir else None
+                start = time.perf_counter()
+                l, markers = _run_solver(command, timeout, temp_dir, log_path, solver.verdict_markers)
+                wall_ms = (time.perf_counter() - start) * 1000
+                result, time_ms = solver.parse_output(l, markers)
                 if result is None:
-                    statistics.add_result(test, time, 0, "other")
-                    print(f"Failed to parse output for {test}")
+                    print(f"Failed to parse output for {test_path}")
                     continue
 
-                if result == 1:
-                    results.append(1)
-                else:
-                    results.append(0)
-                times.append(time)
+                result = 1 if result == 1 else 0
+                if first is None:
+                    first = result
+                elif result != first:
+                    consistent = False
+                # Prefer the solver's own measurement, it excludes process startup
+                total_time += time_ms if time_ms is not None else wall_ms
+                runs += 1
 
             except subprocess.TimeoutExpired:
-                print(f"Timeout for {test}")
-                results.append(TIMEOUT_CODE)
-                times.append(timeout)
+                print(f"Timeout for {test_path}")
+                timed_out = True
+                total_time += timeout
+                runs += 1
                 continue
 
-            except subprocess.CalledProcessError as e:
-                print(f"Failed to run {test}: {e}")
-                results.append(ERROR_CODE)
-                times.append(0)
+            except (subprocess.CalledProcessError, OSError) as e:
+                # OSError: the solver could not be started at all (e.g. not executable)
+                if not _interrupted:
+                    # Otherwise it was killed on purpose, and the test is not recorded
+                    print(f"Failed to run {test_path}: {e}")
+                errored = True
+                runs += 1
                 continue
         
-        average_time = sum(times) / len(times) if times else 0
-
-        if TIMEOUT_CODE in results:
-            statistics.add_result(test, average_time, TIMEOUT_CODE, "timeout")
-        elif ERROR_CODE in results:
-            statistics.add_result(test, average_time, ERROR_CODE, "error")
-        elif not all(elem == results[0] for elem in (results if results else [None])):
-            statistics.add_result(test, average_time, -1, "inconsistent")
+        if _interrupted:
+            return None
+
+        average_time = total_time / runs if runs else 0
+
+        if timed_out:
+            return test_path, average_time, TIMEOUT_CODE, "timeout"
+        elif errored:
+            return test_path, average_time, ERROR_CODE, "error"
+        elif not consistent:
+            return test_path, average_time, -1, "inconsistent"
         else:
-            status = results[0] if results else -1
-            statistics.add_result(test, average_time, status, 'other')
+            status = first if first is not None else -1
+            return test_path, average_time, status, 'other'
     finally:
-        shutil.rmtree(temp_dir)
+        _clear_dir(temp_dir, _solver_links)
         
 
 
@@ -353,7 +702,12 @@ if __name__ == "__main__":
     parser.add_argument("--output", type=str, default="results.csv", help="Output file")
     parser.add_argument("--shard-id", type=int, default=0, help="Shard index (0-indexed)")
     parser.add_argument("--num-shards", type=int, default=1, help="Total number of shards")
+    parser.add_argument("--logdir", type=str, default=None, help="Directory to save solver output logs to")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of tests to run in parallel")
+    parser.add_argument("--pin-cpus", action="store_true", help="Pin each parallel job to its own CPU (Linux only)")
     args = parser.parse_args()
+    if args.pin_cpus and not hasattr(os, "sched_setaffinity"):
+        parser.error("--pin-cpus is not supported on this platform")
 
     # Expand user path and validate
     syft_path = Path(args.path).expanduser().resolve()
@@ -368,7 +722,19 @@ if __name__ == "__main__":
     mode = args.mode
     solver = ChristianSyftSolver(str(syft_path), name="christian") \
         if args.solver != 'lucas' else LucasSyftSolver(str(syft_path), name="lucas")
+
+    if not args.output:
+        output_file = f"results_{args.solver}_{args.mode}.csv"
+    else:
+        output_file = args.output
+
+    # Line buffered, so every result is on disk as soon as it is known
+    csvfile = open(output_file, "w", buffering=1, newline='')
+    statistics.set_output(csvfile)
+
     tests = sorted(collectTest(test_dir))
+    if args.logdir:
+        os.makedirs(args.logdir, exist_ok=True)
     
     if args.num_shards > 1:
         total_tests = len(tests)
@@ -377,8 +743,42 @@ if __name__ == "__main__":
     else:
         print(f"Running all {len(tests)} tests.")
 
-    for test in tests:
-        executeTest(test, timeout, solver, mode, iterations)
+    cpu_queue = None
+    if args.pin_cpus:
+        # Hand out the CPUs this process may run on, wrapping around if there are more jobs
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu_queue = multiprocessing.Queue()
+        for i in range(args.jobs):
+            cpu_queue.put(cpus[i % len(cpus)])
+
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                                      initargs=(cpu_queue,))
+    interrupted = False
+    try:
+        # Build the missing DFAs on all workers up front, so MONA never runs inside a timed test
+        dfa_sources = solver.dfa_sources(tests, mode)
+        if dfa_sources:
+            print(f"Generating {len(dfa_sources)} DFAs.")
+            list(executor.map(_prepare_dfa, dfa_sources))
+
+        futures = [executor.submit(executeTest, test, timeout, solver, mode, iterations, args.logdir) for test in tests]
+        for future in concurrent.futures.as_completed(futures):
+            # Re-raises the first failure in a worker, after cancelling the rest below
+            result = future.result()
+            if result is not None:
+                statistics.add_result(*result)
+    except KeyboardInterrupt:
+        interrupted = True
+        # A second Ctrl-C during the shutdown below would leave the executor half shut down and hang
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        print("Interrupted, cancelling the remaining tests.")
+        # Workers kill their running solvers on SIGINT (needed when the signal
+        # did not come from the terminal, which sends it to the whole group)
+        for worker in multiprocessing.active_children():
+            os.kill(worker.pid, signal.SIGINT)
+    finally:
+        executor.shutdown(cancel_futures=True)
+        csvfile.close()
 
     print("===========")
     print("Statistics:")
@@ -390,16 +790,9 @@ if __name__ == "__main__":
     print(f"Error: {statistics.stats['error']}")
     print(f"Inconsistent: {statistics.stats['inconsistent']}")
 
-    if not args.output:
-        output_file = f"results_{args.solver}_{args.mode}.csv"
-    else:
-        output_file = args.output
-
-    with open(output_file, "w") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["test", "time", "status"])
-        for test, (time, status) in statistics.results.items():
-            writer.writerow([test, time, status])
+    if interrupted:
+        # Exit like an unhandled SIGINT, so callers do not take a cancelled sweep for a finished one
+        sys.exit(128 + signal.SIGINT)
 
 
 